@@ -7,6 +7,9 @@ class Equalizer:
 
     Sub-classes must implement this.
     """
+    # Sub-classes without __slots__ still get __dict__ for their own attributes
+    __slots__ = ('__stream__',)
+
     def __init__(self):
         self.__stream__ = None # type: io.BufferedIOBase
 
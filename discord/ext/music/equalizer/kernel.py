@@ -0,0 +1,57 @@
+# Try to import numba for compiling the equalizer kernel
+try:
+    from numba import njit, types
+    NUMBA_OK = True
+except ImportError:
+    NUMBA_OK = False
+
+def sos_filt_i16(samples, sos, zi, out):
+    # Apply second-order sections to 16-bit PCM samples
+    # using transposed Direct-Form II.
+    # The filter state "zi" has same layout as scipy.signal.sosfilt()
+    # (sections, 2, channels) and it will be updated in-place.
+    for n in range(samples.shape[0]):
+        for c in range(samples.shape[1]):
+            x = float(samples[n, c])
+            for s in range(sos.shape[0]):
+                y = sos[s, 0] * x + zi[s, 0, c]
+                zi[s, 0, c] = sos[s, 1] * x - sos[s, 4] * y + zi[s, 1, c]
+                zi[s, 1, c] = sos[s, 2] * x - sos[s, 5] * y
+                x = y
+
+            # Clip to 16-bit range
+            if x > 32767:
+                x = 32767
+            elif x < -32768:
+                x = -32768
+            out[n, c] = int(x)
+
+if NUMBA_OK:
+    # nogil=True, so equalizers from other voice connections
+    # (and the event loop) are not blocked while filtering
+    sos_filt_i16 = njit(
+        cache=True,
+        nogil=True,
+        fastmath=True,
+        boundscheck=False
+    )(sos_filt_i16)
+
+    # The only signature used by pydubEqualizer (16-bit stereo PCM).
+    # Audio data from stream is read-only, all arrays are C-contiguous.
+    SIGNATURE = types.void(
+        types.Array(types.int16, 2, 'C', readonly=True), # samples
+        types.float64[:, ::1], # sos
+        types.float64[:, :, ::1], # zi
+        types.int16[:, ::1] # out
+    )
+
+_warmed_up = False
+
+def warmup():
+    """Compile (or load from cache) the kernel before the first audio block"""
+    global _warmed_up
+    if _warmed_up:
+        return
+
+    sos_filt_i16.compile(SIGNATURE)
+    _warmed_up = True
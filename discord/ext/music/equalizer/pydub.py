@@ -1,18 +1,36 @@
 import math
-import io
 
 from typing import List, Union
 from discord.opus import _OpusStruct as OpusStruct
 from .base import Equalizer
 
-# Try to import eq function in pydub module
+# Try to import numpy and scipy for designing and applying filters
 try:
-    from pydub import AudioSegment
-    from pydub.scipy_effects import eq as equalizer
+    import numpy as np
+    from .kernel import NUMBA_OK, sos_filt_i16, warmup
+
+    # scipy.signal is slow to import,
+    # only import it if the numba kernel is not available
+    if not NUMBA_OK:
+        from scipy.signal import sosfilt
     EQ_OK = True
 except ImportError:
     EQ_OK = False
 
+def _sosfilt_numba(sos, samples, zi, out):
+    sos_filt_i16(samples, sos, zi, out)
+    return zi
+
+def _sosfilt_scipy(sos, samples, zi, out):
+    equalized, zi = sosfilt(sos, samples, axis=0, zi=zi)
+    np.clip(equalized, -32768, 32767, out=equalized)
+    out[...] = equalized
+    return zi
+
+# Pick the filter implementation once, instead of every block
+if EQ_OK:
+    _sosfilt = _sosfilt_numba if NUMBA_OK else _sosfilt_scipy
+
 __all__ = (
     'pydubError', 'pydubEqualizer', 'pydubSubwooferEqualizer'
 )
@@ -21,16 +39,16 @@ class pydubError(Exception):
     pass
 
 class pydubEqualizer(Equalizer):
-    """A pydub equalizer for Signed-PCM codec
+    """A peaking equalizer for Signed-PCM codec
 
     The audio specifications must be 16-bit 48KHz
 
     Warning
     --------
-    You must have `scipy`_ and `pydub`_ installed, otherwise you will get error.
+    You must have `numpy`_ and `scipy`_ installed, otherwise you will get error.
 
+    .. _numpy: https://pypi.org/project/numpy/
     .. _scipy: https://pypi.org/project/scipy/
-    .. _pydub: https://pypi.org/project/pydub/
 
     Parameters
     -----------
@@ -43,14 +61,44 @@ class pydubEqualizer(Equalizer):
     Raises
     -------
     pydubError
-        pydub and scipy is not installed
+        numpy and scipy is not installed or
+        one of given frequencys is not between 0Hz and 24000Hz
     """
+    # PCM 16-bit 48000Hz Configurations
+    SAMPLE_WIDTH = 2
+    CHANNELS = 2
+    FRAME_RATE = 48000
+    FRAME_WIDTH = CHANNELS * SAMPLE_WIDTH
+
+    # Number of 20ms frames that equalized at once.
+    # The filter state is carried between blocks, so this only affects
+    # how often the filter is called (overhead) and the read latency.
+    FRAMES_PER_BLOCK = 50
 
     def __init__(self, freqs: List[dict]=None):
         if not EQ_OK:
-            raise pydubError('pydub and scipy need to be installed in order to use pydubEqualizer')
+            raise pydubError('numpy and scipy need to be installed in order to use pydubEqualizer')
+
+        super().__init__()
+
+        if NUMBA_OK:
+            warmup()
+
+        self._buffered = None # type: memoryview
+        self._buffered_pos = 0
+
+        # Second-order sections of all frequencys and the filter state
+        self._sos = None
+        self._zi = None
 
-        self._buffered = None
+        # Filters are designed on next read() after frequencys or gains are changed
+        self._dirty = True
+
+        # Reusable output buffer for equalized block
+        self._out = np.empty(
+            (self.FRAMES_PER_BLOCK * OpusStruct.FRAME_SIZE // self.FRAME_WIDTH, self.CHANNELS),
+            dtype='<i2'
+        )
 
         if freqs is not None:
             # Parse the frequencys
@@ -58,28 +106,47 @@ class pydubEqualizer(Equalizer):
         else:
             self._freqs = {}
 
-        # PCM 16-bit 48000Hz Configurations
-        sample_width = 2
-        channels = 2
-        frame_rate = 48000
-
-        # For AudioSegment arguments
-        self._eq_args = {
-            "sample_width": sample_width,
-            "channels": channels,
-            "frame_rate": frame_rate,
-            "frame_width": channels * sample_width
-        }
-
     def _determine_bandwidth(self, freqs):
-        if len(freqs) == 1:
+        # "freqs" is numpy array of frequencies,
+        # only called when filters are redesigned (after mutation)
+        if freqs.size == 1:
             return freqs[0]
-        max_freq = max(freqs)
-        min_freq = min(freqs)
-        return max_freq - min_freq
+        return freqs.max() - freqs.min()
+
+    def _design_sos(self):
+        # Design peaking EQ biquad for each frequency
+        # (see "Audio EQ Cookbook" by Robert Bristow-Johnson)
+        # and stack them as second-order sections,
+        # so all frequencys can be equalized in single filter pass.
+        # This is called from audio player thread,
+        # take a snapshot in case frequencys are changed at the same time.
+        freqs = list(self._freqs.items())
+        if not freqs:
+            self._sos = None
+            return
+
+        # Design all biquads at once with contiguous arrays
+        freq, gain = np.array(freqs, dtype=np.float64).T
+        bandwidth = self._determine_bandwidth(freq)
+        if bandwidth <= 0:
+            raise pydubError('bandwidth must be more than 0Hz')
+
+        A = 10 ** (gain / 40)
+        w0 = 2 * np.pi * freq / self.FRAME_RATE
+        alpha = np.sin(w0) / (2 * (freq / bandwidth))
+        cos_w0 = np.cos(w0)
+        a0 = 1 + alpha / A
+
+        self._sos = np.stack([
+            (1 + alpha * A) / a0,
+            -2 * cos_w0 / a0,
+            (1 - alpha * A) / a0,
+            np.ones_like(a0),
+            -2 * cos_w0 / a0,
+            (1 - alpha / A) / a0
+        ], axis=1)
 
     def _parse_freqs(self, freqs):
-        duplicate = []
         new_freqs = {} # key: freq, value: gain
         for data in freqs:
             freq = data.get('freq')
@@ -93,17 +160,23 @@ class pydubEqualizer(Equalizer):
             
             self._check_freq(freq, gain)
 
-            if freq not in duplicate:
-                duplicate.append(freq)
-            else:
-                raise ValueError('frequency "%s" is more than one')
+            # Parsed frequencies are the dict keys,
+            # use it to check duplicates
+            if freq in new_freqs:
+                raise ValueError('frequency "%s" is more than one' % freq)
 
             new_freqs[freq] = gain
         return new_freqs
 
     def _check_freq(self, freq=None, gain=None):
-        if freq and not isinstance(freq, int):
-            raise ValueError('freq "%s" is not integer type' % freq)
+        if freq is not None:
+            if not isinstance(freq, int):
+                raise ValueError('freq "%s" is not integer type' % freq)
+
+            # The filter is unstable at 0Hz and above nyquist frequency
+            nyquist = self.FRAME_RATE // 2
+            if not 0 < freq < nyquist:
+                raise pydubError('freq "%s" must be between 0Hz and %sHz (exclusive)' % (freq, nyquist))
         
         if gain:
             if isinstance(gain, int) or isinstance(gain, float):
@@ -125,15 +198,16 @@ class pydubEqualizer(Equalizer):
         -------
         ValueError
             given frequency is already exist
+        pydubError
+            given frequency is not between 0Hz and 24000Hz
         """
         self._check_freq(freq, gain)
 
-        try:
-            self._freqs[freq]
-        except KeyError:
-            self._freqs.setdefault(freq, gain)
-        else:
+        if freq in self._freqs:
             raise ValueError('frequency "%s" is more than one, use set_gain() instead' % freq)
+        self._freqs[freq] = gain
+
+        self._dirty = True
 
     def remove_frequency(self, freq: int):
         """Remove a frequency
@@ -154,6 +228,8 @@ class pydubEqualizer(Equalizer):
             self._freqs.pop(freq)
         except KeyError:
             raise ValueError('frequency %s is not exist' % freq)
+
+        self._dirty = True
     
     def set_gain(self, freq: int, gain: int):
         """
@@ -173,13 +249,22 @@ class pydubEqualizer(Equalizer):
         """
         self._check_freq(freq, gain)
 
-        if self._freqs.get(freq) is None:
+        if freq not in self._freqs:
             raise ValueError('frequency %s is not exist' % freq)
+        self._set_gain(freq, gain)
+
+    def _set_gain(self, freq, gain):
+        # Same as set_gain() but without validation,
+        # for callers that already know freq and gain are valid.
         self._freqs[freq] = gain
+        self._dirty = True
 
     def _read_buffered_data(self):
-        # Read the buffered data
-        data = self._buffered.read(OpusStruct.FRAME_SIZE)
+        # Read the buffered data,
+        # this is the only copy of equalized audio data
+        pos = self._buffered_pos
+        data = bytes(self._buffered[pos:pos + OpusStruct.FRAME_SIZE])
+        self._buffered_pos = pos + len(data)
         
         if not data:
             # For re-use
@@ -193,38 +278,50 @@ class pydubEqualizer(Equalizer):
         else:
             return data
 
+    def _equalize(self, data):
+        if self._dirty:
+            self._dirty = False
+            self._design_sos()
+
+        sos = self._sos
+        if sos is None:
+            return data
+
+        channels = self.CHANNELS
+
+        # Filter state is carried between blocks,
+        # so the equalized audio is continuous.
+        zi = self._zi
+        if zi is None or zi.shape[0] != sos.shape[0]:
+            zi = np.zeros((sos.shape[0], 2, channels))
+
+        samples = np.frombuffer(data, dtype='<i2').reshape(-1, channels)
+        out = self._out[:samples.shape[0]]
+
+        self._zi = _sosfilt(sos, samples, zi, out)
+
+        # Return a view of preallocated block instead of copying it,
+        # read() will copy it frame by frame
+        return memoryview(out).cast('B')
+
     def read(self):
         while True:
             if self._buffered is None:
-                # The equalizer cannot convert audio if duration is too small (ex: 20ms)
-                # they will reproduce noisy sound.
-                # So the pydubEqualizer must read audio data for at least 1 second
-                # and then equalize it and move it to buffered equalized audio data.
+                # Read audio data for multiple frames (1 second by default)
+                # and equalize it at once, so the filter is called once per block
+                # instead of every frame, and then move it to buffered equalized audio data.
 
-                data = self.stream.read(50 * OpusStruct.FRAME_SIZE)
+                data = self.stream.read(self.FRAMES_PER_BLOCK * OpusStruct.FRAME_SIZE)
+
+                # Make sure audio data is not cut in the middle of sample
+                data = data[:len(data) - len(data) % self.FRAME_WIDTH]
 
                 if not data:
                     return b''
 
-                # 1 second duration
-                _ = AudioSegment(data, metadata=self._eq_args)
-                segment = None
-
-                # Determine the bandwidth
-                bandwidth = self._determine_bandwidth(list(self._freqs))
-
-                # Equalize the audio
-                for frequency, gain in self._freqs.items():
-                    try:
-                        if segment is None:
-                            segment = equalizer(_, frequency, bandwidth, gain_dB=gain)
-                        else:
-                            segment = equalizer(segment, frequency, bandwidth, gain_dB=gain)
-                    except Exception:
-                        raise pydubError('equalizing audio data failed')
-                
                 # Make buffered data
-                self._buffered = io.BytesIO(segment.raw_data)
+                self._buffered = memoryview(self._equalize(data))
+                self._buffered_pos = 0
 
                 final_data = self._read_buffered_data()
             else:
@@ -248,6 +345,7 @@ class pydubSubwooferEqualizer(Equalizer):
         For example, 0.5 for 50% and 1.75 for 175%.
     """
     def __init__(self, volume: float=0.5):
+        super().__init__()
         self._freq = 60
         freqs = [{
             "freq": self._freq,
@@ -266,24 +364,27 @@ class pydubSubwooferEqualizer(Equalizer):
 
     @volume.setter
     def volume(self, volume):
+        self._volume = volume
+
         # Since given volume 0 or lower will raise error,
         # try to redirectly changed it to lowest dB
         if volume <= 0:
-            self._volume = -20.0
-            self.set_gain(self._volume)
-            return
+            dB = -20.0
+        else:
+            # Adapted from https://github.com/Rapptz/discord.py/blob/master/discord/opus.py#L392
+            dB = 20 * math.log10(volume)
 
-        # Adapted from https://github.com/Rapptz/discord.py/blob/master/discord/opus.py#L392
-        self._volume = 20 * math.log10(volume)
-        self.set_gain(self._volume)
+        self._eq._set_gain(self._freq, dB)
 
     def set_gain(self, dB: float):
         """
         Set frequency gain in dB.
         """
         self._eq.set_gain(self._freq, dB)
+        self._volume = 10 ** (dB / 20)
 
     def setup(self, stream):
+        super().setup(stream)
         self._eq.setup(stream)
 
     def read(self):
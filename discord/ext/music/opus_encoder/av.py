@@ -33,16 +33,29 @@ class LibAVEncoder:
         self._stream = self._opener.add_stream('libopus', rate=rate)
         self.sample_rate = rate
 
+        # Re-used for every pcm data with same size
+        self._frame = None
+
+        # Encode a silent frame, so codec initialization
+        # is not happened in the first audio packet.
+        self.encode(bytes(self.FRAME_SIZE), self.SAMPLES_PER_FRAME)
+
+    def _get_frame(self, pcm_size):
+        frame = self._frame
+        if frame is None or frame.samples != pcm_size:
+            # Adapted from https://github.com/PyAV-Org/PyAV/blob/main/av/audio/frame.pyx#L129-L131
+            frame = av.AudioFrame(format='s16', layout='stereo', samples=pcm_size)
+            frame.sample_rate = self.sample_rate
+            self._frame = frame
+        return frame
+
     def encode(self, pcm_data, pcm_size):
         # Store encoded opus packets with bytearray
         data = bytearray()
 
-        # Adapted from https://github.com/PyAV-Org/PyAV/blob/main/av/audio/frame.pyx#L129-L131
-        # With some modifications
-        frame = av.AudioFrame(format='s16', layout='stereo', samples=pcm_size)
-        frame.sample_rate = self.sample_rate
-        for i, plane in enumerate(frame.planes):
-            plane.update(pcm_data[i:])
+        # Packed s16 stereo only have one plane
+        frame = self._get_frame(pcm_size)
+        frame.planes[0].update(pcm_data)
 
         # Encode pcm data to opus packets
         packets = self._stream.encode(frame)
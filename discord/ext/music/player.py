@@ -1,24 +1,27 @@
-import sys
 import logging
 import time
+import threading
 import asyncio
-import traceback
 
-from discord.utils import maybe_coroutine
 from discord.player import AudioPlayer
 
-from .voice_source import Silence
-
 log = logging.getLogger(__name__)
 
+# Opus encoded silence frame
+_OPUS_SILENCE = b'\xf8\xff\xfe'
+
 class MusicPlayer(AudioPlayer):
     def __init__(self, track, client):
         super().__init__(track.source, client)
         self._play_silence = False
         self.track = track
-        self._silence = Silence()
         self._leaving = client._leaving
-        self._done = client._done
+
+        # Set if stopped by MusicClient, the next track won't be played.
+        # Each player has its own, so starting a new player
+        # can't clear it before this player is done.
+        self._done = threading.Event()
+
         self._error = client._on_error
         
         # Client playlist
@@ -58,68 +61,91 @@ class MusicPlayer(AudioPlayer):
 
         # getattr lookup speed ups
         play_audio = self.client.send_audio_packet
+        end_is_set = self._end.is_set
+        resumed_is_set = self._resumed.is_set
+        connected_is_set = self._connected.is_set
+        perf_counter = time.perf_counter
+        sleep = time.sleep
+        DELAY = self.DELAY
         self._speak(True)
 
-        while not self._end.is_set():
+        # Source can be replaced by set_track(),
+        # is_opus() only need to be checked when that happens
+        source = None
+        encode = True
+
+        # Deadline of the next silence packet, None if we're not paused.
+        # It's local, self.loops and self._start are reset by resume()
+        # from another thread.
+        silence_next = None
+
+        while not end_is_set():
             # are we paused?
-            if not self._resumed.is_set():
+            if not resumed_is_set():
                 # Check if we're allowed to play Silence audio
                 if self._play_silence:
                     # Play opus encoded silence audio
-                    play_audio(self._silence.read(), encode=False)
-
-                    # Add delay to prevent overload CPU usage
-                    time.sleep(0.02)
+                    play_audio(_OPUS_SILENCE, encode=False)
+
+                    # Pace silence with absolute deadlines,
+                    # so send time does not accumulate as drift
+                    if silence_next is None:
+                        silence_next = perf_counter()
+                    silence_next += DELAY
+                    sleep(max(0, silence_next - perf_counter()))
                     continue
 
                 # wait until we aren't
                 self._resumed.wait()
                 continue
 
+            silence_next = None
+
             # are we disconnected from voice?
-            if not self._connected.is_set():
+            if not connected_is_set():
 
-                # Checking if we are really leaving voice
-                while not self._connected.is_set():
-                    if self._leaving.is_set() and not self._connected.is_set():
+                # Checking if we are really leaving voice,
+                # block until we are connected again instead of polling it.
+                while not self._connected.wait(1.0):
+                    if self._leaving.is_set():
                         # We're leaving voice, stopping player
                         self.stop()
                         return
-                    else:
-                        # Add delay to prevent overload CPU usage
-                        time.sleep(0.02)
-                        continue
+
+                    if end_is_set():
+                        # Player is stopped while disconnected
+                        return
                 # reset our internal data
                 self.loops = 0
-                self._start = time.perf_counter()
+                self._start = perf_counter()
+
+            if self.source is not source:
+                source = self.source
+                encode = not source.is_opus()
 
             self.loops += 1
-            data = self.source.read()
+            data = source.read()
 
             if not data:
                 self.stop()
                 break
 
-            play_audio(data, encode=not self.source.is_opus())
-            next_time = self._start + self.DELAY * self.loops
-            delay = max(0, self.DELAY + (next_time - time.perf_counter()))
-            time.sleep(delay)
+            play_audio(data, encode=encode)
+            next_time = self._start + DELAY * self.loops
+            delay = max(0, DELAY + (next_time - perf_counter()))
+            sleep(delay)
 
     def _handle_error(self):
         error = self._current_error
 
         if self._error:
-            fut = asyncio.run_coroutine_threadsafe(maybe_coroutine(self._error, error), self.client.loop)
+            fut = asyncio.run_coroutine_threadsafe(self._error(error), self.client.loop)
             exc = fut.exception()
             if exc:
-                log.exception('Calling on player error function failed.')
                 exc.__context__ = error
-                traceback.print_exception(type(exc), exc, exc.__traceback__)
+                log.error('Calling on player error function failed.', exc_info=exc)
         elif error:
-            msg = 'Exception in MusicPlayer thread {}'.format(self.name)
-            log.exception(msg, exc_info=error)
-            print(msg, file=sys.stderr)
-            traceback.print_exception(type(error), error, error.__traceback__)
+            log.error('Exception in MusicPlayer thread %s', self.name, exc_info=error)
 
     def _call_after(self):
         # Check if MusicClient.stop() is called
@@ -132,29 +158,23 @@ class MusicPlayer(AudioPlayer):
 
         # Call pre-play next function
         if self.pre_func is not None:
-            fut = asyncio.run_coroutine_threadsafe(maybe_coroutine(self.pre_func, track), self.client.loop)
+            fut = asyncio.run_coroutine_threadsafe(self.pre_func(track), self.client.loop)
             exc = fut.exception()
             if exc:
-                log.exception('Calling the pre-play next track function failed.')
-                exc.__context__ = exc
-                traceback.print_exception(type(exc), exc, exc.__traceback__)
+                log.error('Calling the pre-play next track function failed.', exc_info=exc)
 
         # Play the next song
         fut = asyncio.run_coroutine_threadsafe(self.next_song(track), self.client.loop)
         exc = fut.exception()
         if exc:
-            log.exception('Calling play next track failed.')
-            exc.__context__ = exc
-            traceback.print_exception(type(exc), exc, exc.__traceback__)
+            log.error('Calling play next track failed.', exc_info=exc)
 
         # Call post-play next function
         if self.post_func is not None:
-            fut = asyncio.run_coroutine_threadsafe(maybe_coroutine(self.post_func, track), self.client.loop)
+            fut = asyncio.run_coroutine_threadsafe(self.post_func(track), self.client.loop)
             exc = fut.exception()
             if exc:
-                log.exception('Calling the post-play next track function failed.')
-                exc.__context__ = exc
-                traceback.print_exception(type(exc), exc, exc.__traceback__)
+                log.error('Calling the post-play next track function failed.', exc_info=exc)
 
         self._handle_error()
 
@@ -169,6 +189,10 @@ class MusicPlayer(AudioPlayer):
     def stop(self):
         super().stop()
         self.source.recreate()
+
+    def cancel(self):
+        self._done.set()
+        self.stop()
         
     def _set_source(self, source):
         pass
@@ -1,5 +1,5 @@
 import threading
-from typing import List, Union
+from typing import Iterable, List, Union
 from .track import Track
 from .utils.errors import TrackNotExist
 
@@ -9,42 +9,72 @@ class Playlist:
     """a class representing playlist for tracks
 
     This class is thread-safe.
+
+    Note
+    -----
+    Removing tracks keeps the playlist position on the current track.
+    If the current track itself is removed, the track after it
+    takes the current position and it's returned by the next
+    :meth:`get_next_track`, so no track is skipped.
+    If there is no track after it, the position is moved to the last track.
     """
+    # Only mutations take the lock. Single reads (list index, dict lookup,
+    # attribute load) are atomic in CPython and don't need it.
     def __init__(self) -> None:
-        self._tracks = []
+        # Track position is the list index
+        self._tracks = [] # type: List[Track]
+
+        # Track -> position (first occurrence),
+        # for O(1) lookups and membership checks
+        self._index = {}
         self._lock = threading.Lock()
         self._pos = 0
-        self.__original__ = None
 
-    def _reorder_id_tracks(self, tracks):
-        num = 0
-        for t in tracks:
-            t['_id'] = num
-            num += 1
+        # Set if current track is removed, the track in current position
+        # is the next track (see _update_pos())
+        self._current_removed = False
+        self.__original__ = None
 
     def _put(self, track):
-        t = {
-            "_id": len(self._tracks),
-            "track": track
-        }
-        self._tracks.append(t)
-        self._reorder_id_tracks(self._tracks)
-
-    def _get_raw_track(self, track):
-        target = None
-        for t in self._tracks:
-            if t['track'] == track:
-                target = t
-        return target
+        self._index.setdefault(track, len(self._tracks))
+        self._tracks.append(track)
+
+    def _reindex(self):
+        # Positions are shifted after removing a track
+        index = {}
+        for pos, track in enumerate(self._tracks):
+            index.setdefault(track, pos)
+        self._index = index
+
+    def _get_track_pos(self, track):
+        return self._index.get(track)
 
     def _remove(self, track):
-        target = self._get_raw_track(track)
-        if target is None:
+        pos = self._get_track_pos(track)
+        if pos is None:
             raise TrackNotExist('track is not exist')
         # Cleanup audio source
-        target['track'].source.cleanup()
-        self._tracks.remove(target)
-        self._reorder_id_tracks(self._tracks)
+        track.source.cleanup()
+        del self._tracks[pos]
+        self._reindex()
+        self._update_pos((pos,))
+
+    def _update_pos(self, removed):
+        # Called after tracks in given (old) positions are removed,
+        # tracks after them are shifted back.
+        pos = self._pos
+        self._pos -= sum(1 for p in removed if p < pos)
+        if pos in removed:
+            if self._pos < len(self._tracks):
+                # The track after removed current track is the next track
+                self._current_removed = True
+            else:
+                self._pos = max(len(self._tracks) - 1, 0)
+                self._current_removed = False
+
+    def _next_pos(self):
+        # Position that is returned by get_next_track()
+        return self._pos if self._current_removed else self._pos + 1
 
     @property
     def pos(self):
@@ -62,6 +92,20 @@ class Playlist:
         with self._lock:
             self._put(track)
 
+    def add_tracks(self, tracks: Iterable[Track]) -> None:
+        """Add multiple tracks at once
+
+        This is faster than calling :meth:`add_track` for each track.
+
+        Parameters
+        -----------
+        tracks: Iterable[:class:`Track`]
+            The audio tracks that we want to put in playlist.
+        """
+        with self._lock:
+            for track in tracks:
+                self._put(track)
+
     def jump_to_pos(self, pos: int) -> Track:
         """Change playlist pos and return :class:`Track` from given position
         
@@ -81,9 +125,16 @@ class Playlist:
             The audio track from given position
         """
         with self._lock:
-            track = self.get_track_from_pos(pos)
-            raw_track = self._get_raw_track(track)
-            self._pos = raw_track['_id']
+            try:
+                track = self._tracks[pos]
+            except IndexError:
+                raise TrackNotExist('track position %s is not exist' % pos) from None
+
+            # Negative position is counted from the end of playlist
+            if pos < 0:
+                pos += len(self._tracks)
+            self._pos = pos
+            self._current_removed = False
         return track
 
     def remove_track(self, track: Track) -> None:
@@ -102,6 +153,53 @@ class Playlist:
         with self._lock:
             self._remove(track)
 
+    def remove_tracks(self, tracks: Iterable[Track]) -> None:
+        """Remove multiple tracks at once
+
+        This is same as calling :meth:`remove_track` for each track
+        (only the first occurrence of a track is removed, give it
+        more than once to remove more occurrences), but faster
+        because the playlist is rebuilt only once.
+
+        Parameters
+        -----------
+        tracks: Iterable[:class:`Track`]
+            The audio tracks that we want to remove from playlist.
+
+        Raises
+        -------
+        TrackNotExist
+            One of given tracks is not exist, no track is removed
+        """
+        with self._lock:
+            # Track -> number of occurrences to remove
+            counts = {}
+            for track in tracks:
+                if track not in self._index:
+                    raise TrackNotExist('track %s is not exist' % track)
+                counts[track] = counts.get(track, 0) + 1
+
+            new_tracks = []
+            removed = [] # positions of removed tracks
+            for pos, track in enumerate(self._tracks):
+                if counts.get(track):
+                    counts[track] -= 1
+                    removed.append(pos)
+                else:
+                    new_tracks.append(track)
+
+            for track, count in counts.items():
+                if count:
+                    raise TrackNotExist('track %s is not exist' % track)
+
+            for track in set(self._tracks[pos] for pos in removed):
+                # Cleanup audio source
+                track.source.cleanup()
+
+            self._tracks = new_tracks
+            self._reindex()
+            self._update_pos(set(removed))
+
     def remove_track_from_pos(self, pos: int) -> None:
         """Remove a track from given position
         
@@ -123,12 +221,14 @@ class Playlist:
         """Remove all tracks from playlist"""
         with self._lock:
             self._tracks = []
+            self._index = {}
             self._pos = 0
+            self._current_removed = False
 
     def reset_pos_tracks(self) -> None:
         """Reset current position playlist"""
-        with self._lock:
-            self._pos = 0
+        self._pos = 0
+        self._current_removed = False
 
     def is_track_exist(self, track: Track) -> bool:
         """Check if given track is exist in this playlist
@@ -143,8 +243,7 @@ class Playlist:
         :class:`bool`
             `True` if exist, or `False` if not exist
         """
-        t = self._get_raw_track(track)
-        return t != None
+        return track in self._index
     
     def get_all_tracks(self) -> List[Track]:
         """Get all tracks in this playlist
@@ -152,10 +251,12 @@ class Playlist:
         Returns
         --------
         List[:class:`Track`]
-            All tracks in playlist
+            All tracks in playlist, this is a copy (snapshot) of the playlist.
+            Modifying it will not change the playlist.
         """
-        with self._lock:
-            return [t['track'] for t in self._tracks]
+        # No lock needed, list() copies the tracks in one step
+        # (atomic in CPython)
+        return list(self._tracks)
 
     def get_current_track(self) -> Track:
         """Get current track in current position
@@ -165,8 +266,7 @@ class Playlist:
         :class:`Track`
             The current track in current position
         """
-        with self._lock:
-            return self.get_track_from_pos(self._pos)
+        return self.get_track_from_pos(self._pos)
 
     def get_pos_from_track(self, track: Track) -> int:
         """Get a position track from given track
@@ -186,11 +286,10 @@ class Playlist:
         :class:`Track`
             The track position from given track
         """
-        with self._lock:
-            t = self._get_raw_track(track)
-            if t is None:
-                raise TrackNotExist('track %s is not exist' % track) from None
-            return t['_id']
+        pos = self._get_track_pos(track)
+        if pos is None:
+            raise TrackNotExist('track %s is not exist' % track) from None
+        return pos
 
     def get_track_from_pos(self, pos: int) -> Track:
         """Get a track from given position
@@ -210,13 +309,10 @@ class Playlist:
         :class:`Track`
             The track from given position
         """
-        with self._lock:
-            try:
-                t = self._tracks[pos]
-            except IndexError:
-                raise TrackNotExist('track position %s is not exist' % pos) from None
-            else:
-                return t['track']
+        try:
+            return self._tracks[pos]
+        except IndexError:
+            raise TrackNotExist('track position %s is not exist' % pos) from None
 
     def get_next_track(self) -> Union[Track, None]:
         """Get next track
@@ -227,13 +323,12 @@ class Playlist:
             The next track of this playlist
         """
         with self._lock:
-            try:
-                t = self._tracks[self._pos + 1]
-            except IndexError:
+            pos = self._next_pos()
+            if pos >= len(self._tracks):
                 return None
-            else:
-                self._pos += 1
-                return t['track']
+            self._pos = pos
+            self._current_removed = False
+            return self._tracks[pos]
 
     def get_previous_track(self) -> Union[Track, None]:
         """Get previous track
@@ -244,10 +339,9 @@ class Playlist:
             The previous track of this playlist
         """
         with self._lock:
-            try:
-                t = self._tracks[self._pos - 1]
-            except IndexError:
+            pos = self._pos - 1
+            if pos < 0 or pos >= len(self._tracks):
                 return None
-            else:
-                self._pos -= 1
-                return t['track']
\ No newline at end of file
+            self._pos = pos
+            self._current_removed = False
+            return self._tracks[pos]
\ No newline at end of file
@@ -4,6 +4,9 @@ __all__ = ('Track',)
 
 class Track:
     """A audio track containing audio source, name, url, thumbnail
+
+    Tracks are compared and hashed by identity,
+    two tracks with same attributes are different tracks.
     
     Parameters
     -----------
@@ -27,6 +30,14 @@ class Track:
     thumbnail: :class:`str`
         Valid thumbnail url of this track
     """
+    # "__dict__" is kept for extra attributes from kwargs
+    __slots__ = ('name', 'url', 'source', 'thumbnail', '__dict__', '__weakref__')
+
+    # Playlist index is keyed by track,
+    # keep identity comparison even if a subclass adds value equality
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+
     def __init__(
         self,
         source: MusicSource,
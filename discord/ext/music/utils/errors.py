@@ -1,5 +1,13 @@
 from discord.errors import DiscordException
 
+__all__ = (
+    'EqualizerError', 'IllegalSeek', 'InvalidMP3',
+    'InvalidFLAC', 'InvalidVorbis', 'InvalidWAV',
+    'MiniaudioError', 'StreamHTTPError', 'TrackNotExist',
+    'MusicClientException', 'MusicNotPlaying', 'MusicAlreadyPlaying',
+    'NoMoreSongs', 'NotConnected'
+)
+
 class EqualizerError(DiscordException):
     """
     Raised when something happened in Equalizer class
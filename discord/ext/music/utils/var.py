@@ -8,6 +8,8 @@ class ContextVar:
     you can store any type in this thing
 
     """
+    __slots__ = ('_ctx',)
+
     def __init__(self, context=None):
         self._ctx = context
 
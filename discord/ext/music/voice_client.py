@@ -1,24 +1,85 @@
 import asyncio
+import functools
+import logging
 import traceback
 import threading
+import struct
+import queue
 import os
 
-from typing import Callable, Any, Union
+from typing import Callable, Any, Iterable, Union
+from discord.opus import _OpusStruct as OpusStruct
+from discord.utils import maybe_coroutine
 from discord.voice_client import VoiceClient
 from .opus_encoder import get_opus_encoder
 from .equalizer import Equalizer
 from .playlist import Playlist
 from .track import Track
+from .voice_source import MusicSource
 from .player import MusicPlayer
 from .utils.errors import (
     MusicAlreadyPlaying,
-    MusicClientException,
     MusicNotPlaying,
     NoMoreSongs,
-    NotConnected
+    NotConnected,
+    TrackNotExist
 )
 
+try:
+    import nacl.bindings
+    import nacl.utils
+except ImportError:
+    # discord.VoiceClient will raise error if PyNaCl is not installed
+    pass
+
+log = logging.getLogger(__name__)
+
 _OpusEncoder = get_opus_encoder(os.environ.get('OPUS_ENCODER'))
+
+# RTP header: version, payload type, sequence, timestamp, ssrc
+_RTP_HEADER = struct.Struct('>BBHII')
+_LITE_NONCE = struct.Struct('>I')
+
+# Opus encoders from disconnected clients,
+# new clients will re-use it instead of allocating new encoder state.
+# LIFO, so the most recently used (cache-warm) encoder is re-used first.
+# The size is capped, extra encoders are left to the garbage collector.
+_encoder_pool = queue.LifoQueue(maxsize=8)
+
+def _get_encoder():
+    try:
+        return _encoder_pool.get_nowait()
+    except queue.Empty:
+        return _OpusEncoder()
+
+def _release_encoder(encoder):
+    try:
+        _encoder_pool.put_nowait(encoder)
+    except queue.Full:
+        pass
+
+def _as_coroutine_function(func):
+    # Decide once whether the hook needs maybe_coroutine(),
+    # so the player can always call it as coroutine function.
+    # None is kept as it is, it's used to unregister the hook.
+    if func is None or asyncio.iscoroutinefunction(func):
+        return func
+    return functools.partial(maybe_coroutine, func)
+
+def _release_source(source):
+    try:
+        source.recreate()
+    except Exception:
+        log.debug('Failed to release prepared audio source %r', source, exc_info=True)
+
+def _prepare_source(source):
+    try:
+        source.prepare()
+    except Exception:
+        # Sources should keep the error for read(),
+        # so the player will get it when the track is played
+        log.debug('Failed to prepare audio source %r', source, exc_info=True)
+
 __all__ = (
     'MusicClient',
 )
@@ -44,6 +105,8 @@ class MusicClient(VoiceClient):
         music_client = await voice_channel.connect()
         
     """
+    supported_modes = ('aead_xchacha20_poly1305_rtpsize',) + VoiceClient.supported_modes
+
     def __init__(self, client, channel):
         super().__init__(client, channel)
         self._pre_next = None
@@ -53,18 +116,31 @@ class MusicClient(VoiceClient):
         self._on_disconnect = None
         self._on_error = None
 
-        # Will be used for _stop()
-        self._done = asyncio.Event()
-        
         # This will be used if bot is leaving voice channel
         self._leaving = threading.Event()
 
         # Playlist to store tracks
         self._playlist = Playlist()
 
-        # Will be used for music controls
+        # The next track that its audio source is being prepared
+        self._prefetched = None
+
+        # Will be used for music controls that change playlist or player.
+        # pause(), resume(), seek() and rewind() don't need it,
+        # they only forward a single call to the player.
         self._lock = asyncio.Lock()
 
+        # Will be used for connect, disconnect and move_to,
+        # so music controls don't wait for the voice connection
+        self._conn_lock = asyncio.Lock()
+
+        # Preallocated RTP header and nonces for voice packets,
+        # the unused nonce bytes are always zero
+        self._header = bytearray(_RTP_HEADER.size)
+        self._nonce = bytearray(24)
+        self._lite_nonce_buf = bytearray(24)
+        self._lite_nonce_suffix = memoryview(self._lite_nonce_buf)[:4]
+
     def on_disconnect(self, func: Callable[[], Any]):
         """A decorator that register a callable function as hook when disconnected
 
@@ -102,7 +178,7 @@ class MusicClient(VoiceClient):
         TypeError
             The function is not coroutine or async
         """
-        self._on_error = func
+        self._on_error = _as_coroutine_function(func)
 
     async def on_voice_state_update(self, data):
         self.session_id = data['session_id']
@@ -125,29 +201,44 @@ class MusicClient(VoiceClient):
             self._voice_state_complete.set()
 
     async def connect(self, *, reconnect, timeout):
-        async with self._lock:
+        async with self._conn_lock:
             await super().connect(reconnect=reconnect, timeout=timeout)
 
     async def _disconnect(self):
+        player = self._player
         self._stop()
         self._connected.clear()
 
         try:
+            # Closing voice websocket and leaving voice channel
+            # are independent, do both at the same time
             if self.ws:
-                await self.ws.close()
-
-            await self.voice_disconnect()
+                await asyncio.gather(self.ws.close(), self.voice_disconnect())
+            else:
+                await self.voice_disconnect()
         finally:
             self.cleanup()
             if self.socket:
                 self.socket.close()
 
+            # The stopped player can still be sending its last packet,
+            # wait for it in executor so the event loop is not blocked.
+            # It's done within a frame, or a second if it's waiting for connection.
+            if player is not None and player.is_alive():
+                await self.loop.run_in_executor(None, player.join, 2.0)
+
+            # Give the encoder back to the pool,
+            # unless the player thread is still using it
+            if self.encoder and (player is None or not player.is_alive()):
+                _release_encoder(self.encoder)
+                self.encoder = None
+
     async def disconnect(self, *, force=False):
         """Disconnects this voice client from voice."""
         if not force:
             if not self.is_connected():
                 return
-            async with self._lock:
+            async with self._conn_lock:
                 await self._disconnect()
         else:
             await self._disconnect()
@@ -160,7 +251,7 @@ class MusicClient(VoiceClient):
         channel: :class:`discord.VoiceChannel`
             The channel to move to. Must be a voice channel.
         """
-        async with self._lock:
+        async with self._conn_lock:
             await super().move_to(channel)
     
     async def reconnect(self, reconnect=True, timeout=10):
@@ -173,10 +264,118 @@ class MusicClient(VoiceClient):
         timeout: :class:`float`
             The timeout for the connection.
         """
-        async with self._lock:
+        async with self._conn_lock:
             await self.disconnect(force=True)
         await self.connect(reconnect=reconnect, timeout=timeout)
 
+    # Voice packet encryption
+
+    @property
+    def mode(self):
+        return self.__dict__.get('_mode')
+
+    @mode.setter
+    def mode(self, value):
+        # Resolve encryption method once when the mode is negotiated,
+        # instead of every packet
+        self._mode = value
+        self._encrypt = getattr(self, '_encrypt_' + value) if value is not None else None
+
+    @property
+    def secret_key(self):
+        return self.__dict__.get('_secret_key')
+
+    @secret_key.setter
+    def secret_key(self, value):
+        # The key is set once per voice session,
+        # convert it to bytes here instead of every packet.
+        self._secret_key = value
+        self._key = bytes(value) if value is not None else None
+
+    def send_audio_packet(self, data, *, encode=True):
+        """Sends an audio packet composed of the data.
+
+        You must be connected to play audio.
+
+        Parameters
+        ----------
+        data: :class:`bytes`
+            The :term:`py:bytes-like object` denoting PCM or Opus voice data.
+        encode: :class:`bool`
+            Indicates if ``data`` should be encoded into Opus.
+
+        Raises
+        -------
+        ClientException
+            You are not connected.
+        opus.OpusError
+            Encoding the data failed.
+        """
+        # Sequence and timestamp are 16-bit and 32-bit RTP fields,
+        # wrap them with bitmask instead of checked_add() (getattr/setattr)
+        self.sequence = (self.sequence + 1) & 0xFFFF
+        if encode:
+            encoded_data = self.encoder.encode(data, self.encoder.SAMPLES_PER_FRAME)
+        else:
+            encoded_data = data
+        packet = self._get_voice_packet(encoded_data)
+        try:
+            self.socket.sendto(packet, (self.endpoint_ip, self.voice_port))
+        except BlockingIOError:
+            log.warning('A packet has been dropped (seq: %s, timestamp: %s)', self.sequence, self.timestamp)
+
+        self.timestamp = (self.timestamp + OpusStruct.SAMPLES_PER_FRAME) & 0xFFFFFFFF
+
+    def _get_voice_packet(self, data):
+        header = self._header
+
+        # Formulate rtp header
+        _RTP_HEADER.pack_into(header, 0, 0x80, 0x78, self.sequence, self.timestamp, self.ssrc)
+
+        return self._encrypt(header, data)
+
+    def _encrypt_xsalsa20_poly1305(self, header, data):
+        nonce = self._nonce
+        nonce[:12] = header
+
+        # Join all parts at once, so the packet is allocated only once
+        return b''.join((header, nacl.bindings.crypto_secretbox(data, bytes(nonce), self._key)))
+
+    def _encrypt_xsalsa20_poly1305_suffix(self, header, data):
+        nonce = nacl.utils.random(nacl.bindings.crypto_secretbox_NONCEBYTES)
+
+        return b''.join((header, nacl.bindings.crypto_secretbox(data, nonce, self._key), nonce))
+
+    def _encrypt_xsalsa20_poly1305_lite(self, header, data):
+        nonce = self._lite_nonce_buf
+        _LITE_NONCE.pack_into(nonce, 0, self._lite_nonce)
+        self._lite_nonce = (self._lite_nonce + 1) & 0xFFFFFFFF
+
+        return b''.join((
+            header,
+            nacl.bindings.crypto_secretbox(data, bytes(nonce), self._key),
+            self._lite_nonce_suffix
+        ))
+
+    def _encrypt_aead_xchacha20_poly1305_rtpsize(self, header, data):
+        # Same nonce layout as xsalsa20_poly1305_lite (4 bytes counter),
+        # but the RTP header is authenticated as additional data
+        nonce = self._lite_nonce_buf
+        _LITE_NONCE.pack_into(nonce, 0, self._lite_nonce)
+        self._lite_nonce = (self._lite_nonce + 1) & 0xFFFFFFFF
+
+        header = bytes(header)
+        return b''.join((
+            header,
+            nacl.bindings.crypto_aead_xchacha20poly1305_ietf_encrypt(
+                bytes(data),
+                header,
+                bytes(nonce),
+                self._key
+            ),
+            self._lite_nonce_suffix
+        ))
+
     # Playback controls
 
     @property
@@ -241,7 +440,7 @@ class MusicClient(VoiceClient):
         """
         if not callable(func):
             raise TypeError('Expected a callable, got %s' % type(func))
-        self._pre_next = func
+        self._pre_next = _as_coroutine_function(func)
 
     def after_play_next(self, func: Callable[[Union[Track, None]], Any]):
         """A decorator that register callable function (can be coroutine function) as a post-play next track
@@ -263,7 +462,7 @@ class MusicClient(VoiceClient):
         """
         if not callable(func):
             raise TypeError('Expected a callable, got %s' % type(func))
-        self._post_next = func
+        self._post_next = _as_coroutine_function(func)
 
     def add_track(self, track: Track):
         """Add a track to playlist
@@ -275,9 +474,29 @@ class MusicClient(VoiceClient):
         """
         self._playlist.add_track(track)
 
+        # Prepare it now if it's the next track.
+        # This can be called from any thread, run it in event loop.
+        if self._player:
+            self.loop.call_soon_threadsafe(self._prefetch_next)
+
+    def add_tracks(self, tracks: Iterable[Track]):
+        """Add multiple tracks to playlist at once
+        
+        Parameters
+        -----------
+        tracks: Iterable[:class:`Track`]
+            Audio Tracks that we're gonna add to playlist.
+        """
+        self._playlist.add_tracks(tracks)
+
+        # Prepare the next track, if it's one of added tracks.
+        # This can be called from any thread, run it in event loop.
+        if self._player:
+            self.loop.call_soon_threadsafe(self._prefetch_next)
+
     def _play(self, track):
         if not self.encoder and not track.source.is_opus():
-            self.encoder = _OpusEncoder()
+            self.encoder = _get_encoder()
 
         # Apply equalizer
         if self._eq:
@@ -296,8 +515,37 @@ class MusicClient(VoiceClient):
         self._player = MusicPlayer(track, self)
         self._player.start()
 
-        # we are playing
-        self._done.clear()
+        self._prefetch_next()
+
+    def _prefetch_next(self):
+        # Prepare the next track while current track is playing,
+        # so there is no gap between tracks.
+        # Must be called from event loop.
+        try:
+            track = self._playlist.get_track_from_pos(self._playlist._next_pos())
+        except TrackNotExist:
+            track = None
+
+        if track is self._prefetched:
+            return
+        self._release_prefetched()
+
+        if track is not None:
+            self._prefetched = track
+            self.loop.run_in_executor(None, _prepare_source, track.source)
+
+    def _release_prefetched(self):
+        # The prepared track is no longer the next track,
+        # close the connection that is opened by prepare()
+        track = self._prefetched
+        self._prefetched = None
+        if track is None or track is self.track:
+            return
+
+        # No need to recreate sources that don't prepare anything
+        if type(track.source).prepare is MusicSource.prepare:
+            return
+        self.loop.run_in_executor(None, _release_source, track.source)
 
     async def play(self, track: Track):
         """Play a Track
@@ -317,8 +565,7 @@ class MusicClient(VoiceClient):
         TypeError
             "track" paramater is not :class:`Track`
         """
-        if not self.is_connected():
-            raise NotConnected('Not connected to voice.')
+        self._require_connected()
 
         if not isinstance(track, Track):
             raise TypeError('track must an Track not {0.__class__.__name__}'.format(track))
@@ -343,17 +590,26 @@ class MusicClient(VoiceClient):
         TrackNotExist
             Given track position is not exist
         """
-        if not self.is_connected():
-            raise NotConnected('Not connected to voice.')
+        self._require_connected()
         async with self._lock:
             self._stop()
             track = self._playlist.jump_to_pos(pos)
             self._play(track)
 
+    def _require_connected(self):
+        if not self.is_connected():
+            raise NotConnected('Not connected to voice.')
+
+    def _require_player(self):
+        # Return the player, so the caller uses the same player that is checked
+        player = self._player
+        if player is None or not player.is_playing():
+            raise MusicNotPlaying('Not playing any audio')
+        return player
+
     def _stop(self):
         if self._player:
-            self._done.set()
-            self._player.stop()
+            self._player.cancel()
             self._player = None
 
     async def stop(self):
@@ -364,8 +620,7 @@ class MusicClient(VoiceClient):
         MusicNotPlaying
             Not playing any audio
         """
-        if not self.is_playing() or not self._player:
-            raise MusicNotPlaying('Not playing any audio')
+        self._require_player()
         async with self._lock:
             self._stop()
 
@@ -383,10 +638,8 @@ class MusicClient(VoiceClient):
             Not playing any audio     
         """
 
-        if not self.is_playing() or not self._player:
-            raise MusicNotPlaying('Not playing any audio')
-        async with self._lock:
-            self._player.pause(play_silence=play_silence)
+        player = self._require_player()
+        player.pause(play_silence=play_silence)
 
     async def resume(self):
         """Resumes the audio playing.
@@ -398,12 +651,12 @@ class MusicClient(VoiceClient):
         MusicNotPlaying
             Not playing any audio
         """
-        if self.is_playing():
-            raise MusicAlreadyPlaying('Already playing audio')
-        elif not self._player:
+        player = self._player
+        if player is None:
             raise MusicNotPlaying('Not playing any audio')
-        async with self._lock:
-            self._player.resume()
+        elif player.is_playing():
+            raise MusicAlreadyPlaying('Already playing audio')
+        player.resume()
     
     async def seek(self, seconds: Union[int, float]):
         """Jump forward to specified durations
@@ -418,10 +671,8 @@ class MusicClient(VoiceClient):
         MusicNotPlaying
             Not playing any audio
         """
-        if not self.is_playing() or not self._player:
-            raise MusicNotPlaying('Not playing any audio')
-        async with self._lock:
-            self._player.seek(seconds)
+        player = self._require_player()
+        player.seek(seconds)
 
     async def rewind(self, seconds: Union[int, float]):
         """Jump back to specified durations
@@ -436,10 +687,8 @@ class MusicClient(VoiceClient):
         MusicNotPlaying
             Not playing any audio
         """
-        if not self.is_playing() or not self._player:
-            raise MusicNotPlaying('Not playing any audio')
-        async with self._lock:
-            self._player.rewind(seconds)
+        player = self._require_player()
+        player.rewind(seconds)
 
     def get_stream_durations(self) -> Union[float, None]:
         """Optional[:class:`float`]: Get current stream durations in seconds, if playing.
@@ -456,8 +705,7 @@ class MusicClient(VoiceClient):
         NoMoreSongs
             No more songs in playlist.
         """
-        if not self.is_connected():
-            raise NotConnected('Not connected to voice.')
+        self._require_connected()
         async with self._lock:
             self._stop()
             track = self._playlist.get_next_track()
@@ -475,8 +723,7 @@ class MusicClient(VoiceClient):
         NoMoreSongs
             No more songs in playlist.
         """
-        if not self.is_connected():
-            raise NotConnected('Not connected to voice.')
+        self._require_connected()
         async with self._lock:
             self._stop()
             track = self._playlist.get_previous_track()
@@ -484,6 +731,28 @@ class MusicClient(VoiceClient):
                 raise NoMoreSongs('no more songs in playlist')
             self._play(track)
 
+    def _remove_track(self, track, remove, *args):
+        # Skip to next track if given track is playing
+        player = self._player
+        playing = player is not None and player.is_playing() and player.track is track
+        if playing:
+            self._stop()
+            next_track = self._playlist.get_next_track()
+
+        # Removed track source is cleaned up by playlist
+        if track is self._prefetched:
+            self._prefetched = None
+
+        remove(*args)
+
+        # Play and prepare the next track after the track is removed,
+        # so the playlist positions are already shifted
+        if playing:
+            if next_track is not None:
+                self._play(next_track)
+        elif self._player:
+            self._prefetch_next()
+
     async def remove_track(self, track: Track):
         """Remove a track and stop the player (if given track same as playing track)
         
@@ -497,17 +766,8 @@ class MusicClient(VoiceClient):
         TrackNotExist
             Given track is not exist
         """
-        if self.is_playing():
-            _track = self._player.track
-            if _track == track:
-                # Skip to next track if same track
-                try:
-                    await self.next_track()
-                except MusicClientException:
-                    # Ignore if next track is not exist
-                    pass
         async with self._lock:
-            self._playlist.remove_track(track)
+            self._remove_track(track, self._playlist.remove_track, track)
 
     async def remove_track_from_pos(self, pos: int):
         """Remove a track from given position and stop the player (if given pos same as playing track pos)
@@ -522,23 +782,17 @@ class MusicClient(VoiceClient):
         TrackNotExist
             Given track is not exist
         """
-        track = self._playlist.get_track_from_pos(pos)
-        if self.is_playing():
-            _track = self._player.track
-            if _track == track:
-                try:
-                    await self.next_track()
-                except MusicClientException:
-                    # Ignore if next track is not exist
-                    pass
         async with self._lock:
-            self._playlist.remove_track_from_pos(pos)
+            track = self._playlist.get_track_from_pos(pos)
+            self._remove_track(track, self._playlist.remove_track_from_pos, pos)
 
     async def remove_all_tracks(self):
         """Remove all tracks and stop the player (if playing)"""
         async with self._lock:
             if self.is_playing():
                 self._stop()
+            # Sources are not cleaned up by playlist
+            self._release_prefetched()
             self._playlist.remove_all_tracks()
 
     # Track related
@@ -82,6 +82,9 @@ class LibAVOpusAudio(MusicSource):
     def set_equalizer(self, equalizer):
         raise NotImplementedError
 
+    def prepare(self):
+        self.stream.prepare()
+
     def read(self):
         return next(self._ogg_stream, b'')
 
@@ -144,6 +147,9 @@ class LibAVPCMAudio(RawPCMAudio):
         self.stream.close()
         self.stream = LibAVAudioStream(**self.__stream_kwargs__)
 
+    def prepare(self):
+        self.stream.prepare()
+
     def get_stream_durations(self):
         return self.stream.tell()
 
@@ -21,12 +21,15 @@ class LibAVIO(io.RawIOBase):
     def read(self, n=-1):
         with self.lock:
             if n <= 0:
-                data = self.buf[0:]
-                del self.buf[0:]
+                data = bytes(self.buf)
+                self.buf.clear()
             else:
-                data = self.buf[:n]
+                # Copy directly from the buffer to bytes,
+                # slicing bytearray would make another copy
+                with memoryview(self.buf) as view:
+                    data = view[:n].tobytes()
                 del self.buf[:n]
-        return bytes(data)
+        return data
 
     def write(self, buf):
         with self.lock:
@@ -36,6 +36,14 @@ class LibAVAudioStream(io.RawIOBase):
         self.muxer = None
         self.demuxer = None
         self._lock = threading.Lock()
+
+        # Used by read() and prepare(), they can be called from different threads.
+        # It's never taken by close(), so the event loop don't wait
+        # for opening connection or decoding.
+        self._read_lock = threading.Lock()
+
+        # Error from prepare(), raised in the next read()
+        self._error = None
         self._closed = threading.Event()
         self._stopped = threading.Event()
 
@@ -102,7 +110,12 @@ class LibAVAudioStream(io.RawIOBase):
     def close(self):
         self._close()
         self.buffer = LibAVIO()
-        self.iter_data.close()
+        try:
+            self.iter_data.close()
+        except ValueError:
+            # The generator is running in read() or prepare(),
+            # they will stop since the stream is closed
+            pass
 
     def _iter_av_packets(self, seek=None):
         self.reconnect(seek)
@@ -175,13 +188,39 @@ class LibAVAudioStream(io.RawIOBase):
     def tell(self):
         return self.pos
 
-    def read(self, n=-1):
-        while True:
-            data = next(self.iter_data, b'')
+    def _next_data(self):
+        data = next(self.iter_data, None)
+        if data is None:
+            # The generator is exhausted or it's failed before,
+            # there is no more data
+            self._closed.set()
+        else:
             self.buffer.write(data)
-            if not self.is_closed() and self.buffer.length < n:
-                continue
-            # Make sure the buffer are empty, if stream already ended.
-            elif self.is_closed() and not self.buffer:
-                return b''
-            return self.buffer.read(n)
+
+    def prepare(self):
+        # Open the connection and decode the first packets ahead of time,
+        # the data is kept in buffer for the next read()
+        with self._read_lock:
+            if self.buffer.length or self.is_closed():
+                return
+            try:
+                self._next_data()
+            except Exception as e:
+                # Let the player get the error
+                self._error = e
+
+    def read(self, n=-1):
+        with self._read_lock:
+            error = self._error
+            if error is not None:
+                self._error = None
+                raise error
+
+            while True:
+                self._next_data()
+                if not self.is_closed() and self.buffer.length < n:
+                    continue
+                # Make sure the buffer are empty, if stream already ended.
+                elif self.is_closed() and not self.buffer.length:
+                    return b''
+                return self.buffer.read(n)
@@ -53,6 +53,17 @@ class MusicSource(discord.AudioSource):
         """Recreate audio source, useful for next and previous playback"""
         raise NotImplementedError
 
+    def prepare(self):
+        """Prepare audio source before it's being played.
+
+        This is called in separate thread when the track is next in playlist,
+        so the blocking works (opening connection, decoding the first packets, etc)
+        are done before the track is played.
+
+        Subclasses can implement this, by default it does nothing.
+        """
+        pass
+
     def seekable(self):
         """
         Check if this source support seek() and rewind() operations or not
@@ -139,7 +150,7 @@ class MusicSource(discord.AudioSource):
 
 class Silence(MusicSource):
     def read(self):
-        return bytes(bytearray([0xF8, 0xFF, 0xFE]))
+        return b'\xf8\xff\xfe'
 
     def is_opus(self):
         # Return true so we don't need to encode it
@@ -167,7 +178,9 @@ class RawPCMAudio(MusicSource):
     ):
         super().__init__()
         self.stream = stream
-        self._durations = 0
+        # Number of frames that have been read,
+        # updated by read() and read without lock by get_stream_durations()
+        self._frames = 0
         self._eq = None # type: Equalizer
         self._lock = threading.Lock()
         self._buffered_eq = None
@@ -184,6 +197,8 @@ class RawPCMAudio(MusicSource):
             if len(data) != OpusEncoder.FRAME_SIZE:
                 return b''
 
+            self._frames += 1
+
             # Change volume audio
             if self.volume is None:
                 return data
@@ -198,12 +213,13 @@ class RawPCMAudio(MusicSource):
             raise IllegalSeek('current stream doesn\'t support seek() operations')
         with self._lock:
             self.stream.seek(0, 0)
+            self._frames = 0
 
     def seekable(self):
         return self.stream.seekable()
 
     def get_stream_durations(self):
-        return self._durations
+        return self._frames * OpusEncoder.FRAME_LENGTH / 1000
 
     def set_volume(self, volume):
         vol = max(volume, 0.0) if volume is not None else None
@@ -272,7 +288,7 @@ class RawPCMAudio(MusicSource):
             self.stream.seek(seek, 0)
 
             # Change current stream durations
-            self._durations = s_pos / 1000 * 20 / OpusEncoder.FRAME_SIZE
+            self._frames = seek // OpusEncoder.FRAME_SIZE
 
     def rewind(self, seconds: float):
         if not self.seekable():
@@ -300,7 +316,7 @@ class RawPCMAudio(MusicSource):
             self.stream.seek(seek, 0)
 
             # Change current stream durations
-            self._durations = c_pos / 1000 * 20 / OpusEncoder.FRAME_SIZE
+            self._frames = seek // OpusEncoder.FRAME_SIZE
 
 class WAVAudio(RawPCMAudio):
     """
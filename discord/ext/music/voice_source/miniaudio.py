@@ -1,5 +1,7 @@
 import asyncio
 import io
+import os
+from concurrent.futures import ThreadPoolExecutor
 from .legacy import RawPCMAudio
 from ..utils.errors import *
 
@@ -10,6 +12,16 @@ try:
 except ImportError:
     MINIAUDIO_OK = False
 
+# Decoding is CPU-bound, run it in single shared thread pool sized to CPU cores
+# so it will not fill up the event loop default executor.
+_decoder = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix='MiniaudioDecoder')
+
+def _read_and_decode(cls, filename):
+    # Read and decode audio file in decoder thread pool
+    with open(filename, 'rb') as o:
+        data = o.read()
+    return cls._decode(data)
+
 __all__ = (
     'Miniaudio', 'MP3toPCMAudio', 'FLACtoPCMAudio', 
     'VorbistoPCMAudio', 'WAVtoPCMAudio'
@@ -95,7 +107,7 @@ class MP3toPCMAudio(Miniaudio):
             Set initial volume, default to `0.5`
         """
         loop = asyncio.get_event_loop()
-        c_data = await loop.run_in_executor(None, lambda: cls._decode(data))
+        c_data = await loop.run_in_executor(_decoder, cls._decode, data)
         return cls(c_data, volume, converted=True)
 
     @classmethod
@@ -110,12 +122,8 @@ class MP3toPCMAudio(Miniaudio):
         volume: :class:`float`
             Set initial volume, default to `0.5`
         """
-        def read_data(cls, filename):
-            with open(filename, 'rb') as o:
-                data = o.read()
-            return cls._decode(data)
         loop = asyncio.get_event_loop()
-        c_data = await loop.run_in_executor(None, lambda: read_data(cls, filename))
+        c_data = await loop.run_in_executor(_decoder, _read_and_decode, cls, filename)
         return cls(c_data, volume, converted=True)
 
     @classmethod
@@ -184,7 +192,7 @@ class FLACtoPCMAudio(Miniaudio):
             Set initial volume, default to `0.5`
         """
         loop = asyncio.get_event_loop()
-        c_data = await loop.run_in_executor(None, lambda: cls._decode(data))
+        c_data = await loop.run_in_executor(_decoder, cls._decode, data)
         return cls(c_data, volume, converted=True)
 
     @classmethod
@@ -199,12 +207,8 @@ class FLACtoPCMAudio(Miniaudio):
         volume: :class:`float`
             Set initial volume, default to `0.5`
         """
-        def read_data(cls, filename):
-            with open(filename, 'rb') as o:
-                data = o.read()
-            return cls._decode(data)
         loop = asyncio.get_event_loop()
-        c_data = await loop.run_in_executor(None, lambda: read_data(cls, filename))
+        c_data = await loop.run_in_executor(_decoder, _read_and_decode, cls, filename)
         return cls(c_data, volume, converted=True)
 
     @classmethod
@@ -273,7 +277,7 @@ class VorbistoPCMAudio(Miniaudio):
             Set initial volume, default to `0.5`
         """
         loop = asyncio.get_event_loop()
-        c_data = await loop.run_in_executor(None, lambda: cls._decode(data))
+        c_data = await loop.run_in_executor(_decoder, cls._decode, data)
         return cls(c_data, volume, converted=True)
 
     @classmethod
@@ -288,12 +292,8 @@ class VorbistoPCMAudio(Miniaudio):
         volume: :class:`float`
             Set initial volume, default to `0.5`
         """
-        def read_data(cls, filename):
-            with open(filename, 'rb') as o:
-                data = o.read()
-            return cls._decode(data)
         loop = asyncio.get_event_loop()
-        c_data = await loop.run_in_executor(None, lambda: read_data(cls, filename))
+        c_data = await loop.run_in_executor(_decoder, _read_and_decode, cls, filename)
         return cls(c_data, volume, converted=True)
 
     @classmethod
@@ -362,7 +362,7 @@ class WAVtoPCMAudio(Miniaudio):
             Set initial volume, default to `0.5`
         """
         loop = asyncio.get_event_loop()
-        c_data = await loop.run_in_executor(None, lambda: cls._decode(data))
+        c_data = await loop.run_in_executor(_decoder, cls._decode, data)
         return cls(c_data, volume, converted=True)
 
     @classmethod
@@ -377,12 +377,8 @@ class WAVtoPCMAudio(Miniaudio):
         volume: :class:`float`
             Set initial volume, default to `0.5`
         """
-        def read_data(cls, filename):
-            with open(filename, 'rb') as o:
-                data = o.read()
-            return cls._decode(data)
         loop = asyncio.get_event_loop()
-        c_data = await loop.run_in_executor(None, lambda: read_data(cls, filename))
+        c_data = await loop.run_in_executor(_decoder, _read_and_decode, cls, filename)
         return cls(c_data, volume, converted=True)
 
     @classmethod
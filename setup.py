@@ -23,7 +23,7 @@ version = _version.group()
 
 extras_require = {
     'equalizer': [
-        'pydub',
+        'numpy',
         'scipy'
     ],
     'miniaudio': [
@@ -32,9 +32,13 @@ extras_require = {
     'av': [
         'av==8.0.3'
     ],
+    'numba': [
+        'numba'
+    ],
     'all': [
-        'pydub',
+        'numpy',
         'scipy',
+        'numba',
         'miniaudio',
         'av'
     ],